@@ -6,6 +6,10 @@
     :license: MIT, see LICENSE for more details.
 """
 # pylint: disable=invalid-name
+import collections
+import concurrent.futures
+import threading
+import time
 import warnings
 
 
@@ -36,6 +40,19 @@ VALID_CALL_ARGS = set((
     'verify',
 ))
 
+# Per-call HTTP header templates. call() copies one of these rather than
+# rebuilding the same dict on every request. The 'identity' value asks for
+# an uncompressed response outright instead of dropping the header and
+# leaving the negotiation up to http.client.
+COMPRESSED_HEADERS = {
+    'Accept': '*/*',
+    'Accept-Encoding': 'gzip, deflate, compress',
+}
+UNCOMPRESSED_HEADERS = {
+    'Accept': '*/*',
+    'Accept-Encoding': 'identity',
+}
+
 
 def create_client_from_env(username=None,
                            api_key=None,
@@ -141,18 +158,82 @@ def Client(**kwargs):
 
 
 class BaseClient(object):
+    # The cache and executor bookkeeping pushes this over the limit.
+    # pylint: disable=too-many-instance-attributes
     """Base SoftLayer API client.
 
     :param auth: auth driver that looks like SoftLayer.auth.AuthenticationBase
     :param transport: An object that's callable with this signature:
-                      transport(SoftLayer.transports.Request)
+                      transport(SoftLayer.transports.Request). When not
+                      given, a transport is built from environment/config
+                      settings on first use, so clients that never make a
+                      call never pay for transport setup.
+    :param integer cache_ttl: (optional) seconds to keep results of calls
+        marked cacheable=True. Caching is disabled when this is None.
+    :param integer cache_size: (optional) maximum number of cached results
+        to keep before evicting the least recently used ones
     """
 
     _prefix = "SoftLayer_"
 
-    def __init__(self, auth=None, transport=None):
+    __slots__ = ('auth', '_transport', '_transport_lock', '_services',
+                 '_cache', '_cache_ttl', '_cache_size', '_cache_lock',
+                 '_executor', '_executor_lock')
+
+    def __init__(self, auth=None, transport=None,
+                 cache_ttl=None, cache_size=1024):
         self.auth = auth
-        self.transport = transport
+        self._transport = transport
+        self._transport_lock = threading.Lock()
+        self._services = {}
+        self._cache = collections.OrderedDict()
+        self._cache_ttl = cache_ttl
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks, the executor, and cached results cannot be copied or
+        # pickled. Reduce the client to its constructor arguments so
+        # copy.deepcopy() (which the interactive shell applies to its
+        # whole environment) keeps working.
+        return {'auth': self.auth,
+                'transport': self._transport,
+                'cache_ttl': self._cache_ttl,
+                'cache_size': self._cache_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def transport(self):
+        """Returns the transport, creating a default one on first use."""
+        if self._transport is None:
+            # Double-checked so concurrent first calls (call_async,
+            # multicall) share one transport instead of racing to
+            # build several and stranding their sessions.
+            with self._transport_lock:
+                if self._transport is None:
+                    settings = config.get_client_settings()
+                    url = settings.get('endpoint_url')
+                    if url is not None and '/rest' in url:
+                        self._transport = transports.RestTransport(
+                            endpoint_url=url,
+                            proxy=settings.get('proxy'),
+                            timeout=settings.get('timeout'),
+                        )
+                    else:
+                        self._transport = transports.XmlRpcTransport(
+                            endpoint_url=url,
+                            proxy=settings.get('proxy'),
+                            timeout=settings.get('timeout'),
+                        )
+        return self._transport
+
+    @transport.setter
+    def transport(self, value):
+        self._transport = value
 
     def authenticate_with_password(self, username, password,
                                    security_question_id=None,
@@ -186,7 +267,9 @@ class BaseClient(object):
             <Service: Account>
 
         """
-        return Service(self, name)
+        if name not in self._services:
+            self._services[name] = Service(self, name)
+        return self._services[name]
 
     def call(self, service, method, *args, **kwargs):
         """Make a SoftLayer API call.
@@ -202,6 +285,10 @@ class BaseClient(object):
         :param int limit: (optional) return at most this many results
         :param int offset: (optional) offset results by this many
         :param boolean iter: (optional) if True, returns a generator with the results
+        :param boolean cacheable: (optional) if True and the client was
+            created with a cache_ttl, identical calls return cached results
+            without hitting the API. Only mark idempotent calls
+            (getObject/getAllObjects style) as cacheable.
         :param bool verify: verify SSL cert
         :param cert: client certificate path
 
@@ -217,6 +304,8 @@ class BaseClient(object):
             # keeps those sections working
             return list(self.iter_call(service, method, *args, **kwargs))
 
+        cacheable = kwargs.pop('cacheable', False)
+
         invalid_kwargs = set(kwargs.keys()) - VALID_CALL_ARGS
         if invalid_kwargs:
             raise TypeError(
@@ -226,15 +315,34 @@ class BaseClient(object):
         if self._prefix and not service.startswith(prefixes):
             service = self._prefix + service
 
-        http_headers = {'Accept': '*/*'}
+        cache_key = None
+        if cacheable and self._cache_ttl:
+            # repr() gives a stable, hashable key even when args or kwargs
+            # contain dicts (masks, filters, headers).
+            cache_key = (service, method, repr(args),
+                         repr(sorted(kwargs.items(), key=str)))
+            # Locked so concurrent calls (iter_call concurrency, multicall,
+            # call_async) can't race expiry deletes against each other or
+            # mutate the OrderedDict mid-eviction.
+            with self._cache_lock:
+                try:
+                    cached_at, cached_result = self._cache[cache_key]
+                except KeyError:
+                    pass
+                else:
+                    if time.time() - cached_at < self._cache_ttl:
+                        self._cache.move_to_end(cache_key)
+                        return cached_result
+                    del self._cache[cache_key]
 
         if kwargs.get('compress', True):
-            http_headers['Accept-Encoding'] = 'gzip, deflate, compress'
+            http_headers = COMPRESSED_HEADERS.copy()
         else:
-            http_headers['Accept-Encoding'] = None
+            http_headers = UNCOMPRESSED_HEADERS.copy()
 
-        if kwargs.get('raw_headers'):
-            http_headers.update(kwargs.get('raw_headers'))
+        raw_headers = kwargs.get('raw_headers')
+        if raw_headers:
+            http_headers.update(raw_headers)
 
         request = transports.Request()
         request.service = service
@@ -260,16 +368,98 @@ class BaseClient(object):
             request = self.auth.get_request(request)
 
         request.headers.update(kwargs.get('headers', {}))
-        return self.transport(request)
+        # pylint: disable=not-callable
+        result = self.transport(request)
+
+        if cache_key is not None:
+            with self._cache_lock:
+                self._cache[cache_key] = (time.time(), result)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        return result
 
     __call__ = call
 
+    def call_async(self, service, method, *args, **kwargs):
+        """Makes a SoftLayer API call without blocking.
+
+        Takes the same arguments as ``call`` but returns a
+        :class:`concurrent.futures.Future` immediately. The future resolves
+        to whatever ``call`` would have returned, or raises its exception
+        when the result is collected. This lets applications fan out many
+        API calls and overlap their round trips.
+
+        The backing thread pool is created on first use and lives for the
+        lifetime of the client; call ``close`` to shut it down earlier.
+
+        Usage:
+            >>> import SoftLayer
+            >>> client = SoftLayer.create_client_from_env()
+            >>> future = client.call_async('Account', 'getObject')
+            >>> future.result()['companyName']
+            'Your Company'
+
+        """
+        if self._executor is None:
+            # Double-checked so racing first calls share one pool. Worker
+            # count matches the transports' keep-alive pool size, so every
+            # in-flight call can hold a pooled connection.
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=transports.POOL_MAXSIZE)
+        return self._executor.submit(self.call, service, method,
+                                     *args, **kwargs)
+
+    def close(self):
+        """Shuts down the thread pool backing call_async.
+
+        Waits for outstanding futures to finish. The client stays usable;
+        a new pool is created if call_async is used again.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def multicall(self, calls, workers=4):
+        """Makes several SoftLayer API calls at once and returns the results.
+
+        The calls are issued concurrently, so N related calls cost roughly
+        one round trip instead of N. Results are returned in the same order
+        the calls were given. Exceptions raised by individual calls are
+        re-raised when their result is collected.
+
+        :param calls: a list of (service, method, args, kwargs) tuples.
+            args and kwargs may be omitted for simple calls.
+        :param integer workers: maximum number of calls in flight at once
+
+        Usage:
+            >>> import SoftLayer
+            >>> client = SoftLayer.create_client_from_env()
+            >>> client.multicall([('Account', 'getObject'),
+            ...                   ('Account', 'getVirtualGuests', (), {'limit': 10})])
+            [...]
+
+        """
+        def issue_call(call):
+            service, method = call[0], call[1]
+            args = call[2] if len(call) > 2 else ()
+            kwargs = call[3] if len(call) > 3 else {}
+            return self.call(service, method, *args, **kwargs)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(issue_call, calls))
+
     def iter_call(self, service, method, *args, **kwargs):
         """A generator that deals with paginating through results.
 
         :param service: the name of the SoftLayer API service
         :param method: the method to call on the service
         :param integer limit: result size for each API call (defaults to 100)
+        :param integer concurrency: number of API calls to have in flight at
+            once when paginating (defaults to 1, which pages serially)
         :param \\*args: same optional arguments that ``Service.call`` takes
         :param \\*\\*kwargs: same optional keyword arguments that ``Service.call`` takes
 
@@ -277,12 +467,19 @@ class BaseClient(object):
 
         limit = kwargs.pop('limit', 100)
         offset = kwargs.pop('offset', 0)
+        concurrency = kwargs.pop('concurrency', 1)
 
         if limit <= 0:
             raise AttributeError("Limit size should be greater than zero.")
 
         # Set to make unit tests, which call this function directly, play nice.
         kwargs['iter'] = False
+
+        if concurrency > 1:
+            yield from self._iter_call_concurrently(
+                service, method, limit, offset, concurrency, *args, **kwargs)
+            return
+
         result_count = 0
         keep_looping = True
 
@@ -313,8 +510,73 @@ class BaseClient(object):
 
             offset += limit
 
+    def _iter_call_concurrently(self, service, method, limit, offset,
+                                concurrency, *args, **kwargs):
+        """Pages through results with several API calls in flight at once.
+
+        The first page is fetched on its own to learn the total result
+        count. The remaining pages are then requested through a thread
+        pool in a sliding window of `concurrency` calls, while results are
+        still yielded in offset order.
+        """
+        results = self.call(service, method, offset=offset, limit=limit,
+                            *args, **kwargs)
+
+        if not isinstance(results, transports.SoftLayerListResult):
+            if isinstance(results, list):
+                results = transports.SoftLayerListResult(results, len(results))
+            else:
+                yield results
+                return
+
+        yield from results
+        result_count = len(results)
+
+        if len(results) < limit or result_count >= results.total_count:
+            return
+
+        offsets = list(range(offset + limit, offset + results.total_count, limit))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = collections.deque()
+            next_page = 0
+
+            while next_page < len(offsets) and len(pending) < concurrency:
+                pending.append(executor.submit(self.call, service, method,
+                                               offset=offsets[next_page],
+                                               limit=limit, *args, **kwargs))
+                next_page += 1
+
+            while pending:
+                results = pending.popleft().result()
+
+                if not isinstance(results, transports.SoftLayerListResult):
+                    if isinstance(results, list):
+                        results = transports.SoftLayerListResult(
+                            results, len(results))
+                    else:
+                        yield results
+                        break
+
+                if next_page < len(offsets):
+                    pending.append(executor.submit(self.call, service, method,
+                                                   offset=offsets[next_page],
+                                                   limit=limit, *args, **kwargs))
+                    next_page += 1
+
+                yield from results
+                result_count += len(results)
+
+                # Got less results than requested, we are at the end
+                if len(results) < limit:
+                    break
+                # Got all the needed items
+                if result_count >= results.total_count:
+                    break
+
     def __repr__(self):
-        return "Client(transport=%r, auth=%r)" % (self.transport, self.auth)
+        # Formats the private attribute so printing an idle client doesn't
+        # build the default transport as a side effect.
+        return "Client(transport=%r, auth=%r)" % (self._transport, self.auth)
 
     __str__ = __repr__
 
@@ -330,9 +592,12 @@ class Service(object):
 
     """
 
+    __slots__ = ('client', 'name', '_method_cache')
+
     def __init__(self, client, name):
         self.client = client
         self.name = name
+        self._method_cache = {}
 
     def call(self, name, *args, **kwargs):
         """Make a SoftLayer API call
@@ -382,9 +647,16 @@ class Service(object):
         if name in ["__name__", "__bases__"]:
             raise AttributeError("'Obj' object has no attribute '%s'" % name)
 
+        try:
+            return self._method_cache[name]
+        except KeyError:
+            pass
+
         def call_handler(*args, **kwargs):
             " Handler that actually makes the API call "
             return self(name, *args, **kwargs)
+
+        self._method_cache[name] = call_handler
         return call_handler
 
     def __repr__(self):
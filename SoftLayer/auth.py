@@ -46,14 +46,17 @@ class TokenAuthentication(AuthenticationBase):
     def __init__(self, user_id, auth_token):
         self.user_id = user_id
         self.auth_token = auth_token
+        # Built once here so every request shares the same header dict
+        # instead of re-creating it per call.
+        self._auth_header = {
+            'complexType': 'PortalLoginToken',
+            'userId': user_id,
+            'authToken': auth_token,
+        }
 
     def get_request(self, request):
         """Sets token-based auth headers."""
-        request.headers['authenticate'] = {
-            'complexType': 'PortalLoginToken',
-            'userId': self.user_id,
-            'authToken': self.auth_token,
-        }
+        request.headers['authenticate'] = self._auth_header
         return request
 
     def __repr__(self):
@@ -70,6 +73,10 @@ class BasicAuthentication(AuthenticationBase):
     def __init__(self, username, api_key):
         self.username = username
         self.api_key = api_key
+        self._auth_header = {
+            'username': username,
+            'apiKey': api_key,
+        }
 
     def get_request(self, request):
         """Sets token-based auth headers."""
@@ -79,10 +86,7 @@ class BasicAuthentication(AuthenticationBase):
             request.transport_user = self.username
             request.transport_password = self.api_key
         else:
-            request.headers['authenticate'] = {
-                'username': self.username,
-                'apiKey': self.api_key,
-            }
+            request.headers['authenticate'] = self._auth_header
 
         return request
 
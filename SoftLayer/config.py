@@ -73,6 +73,8 @@ SETTING_RESOLVERS = [get_client_settings_args,
                      get_client_settings_env,
                      get_client_settings_config_file]
 
+ALL_SETTINGS = ('endpoint_url', 'timeout', 'proxy', 'username', 'api_key')
+
 
 def get_client_settings(**kwargs):
     """Parse client settings.
@@ -90,4 +92,9 @@ def get_client_settings(**kwargs):
             settings.update((k, v) for k, v in all_settings.items() if v)
             all_settings = settings
 
+        # Once every setting is resolved there is no reason to keep probing
+        # the environment or reading config files from disk.
+        if all(all_settings.get(name) for name in ALL_SETTINGS):
+            break
+
     return all_settings
@@ -11,6 +11,7 @@ import json
 import logging
 import re
 from string import Template
+import threading
 import time
 import xmlrpc.client
 
@@ -18,6 +19,22 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    # When defusedxml is available, response parsing is hardened against
+    # entity expansion and external entity attacks. It keeps the C expat
+    # parser, so there is no parsing speed penalty.
+    from defusedxml import xmlrpc as defused_xmlrpc
+except ImportError:
+    defused_xmlrpc = None
+
+try:
+    # ujson decodes large JSON response bodies several times faster than
+    # the stdlib json module. Serializing stays with stdlib json because
+    # requests are small and need ComplexEncoder.
+    from ujson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from SoftLayer import consts
 from SoftLayer import exceptions
 from SoftLayer import utils
@@ -36,6 +53,28 @@ __all__ = [
     'SoftLayerListResult',
 ]
 
+# Connection pool bounds for the shared requests session. Connections over
+# pool_maxsize are discarded after use rather than kept alive, so this also
+# caps how many persistent sockets are retained per endpoint.
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+# Mapping of XML-RPC fault codes to exception classes, built once rather
+# than on every fault. These exceptions are formed from the XML-RPC spec
+# http://xmlrpc-epi.sourceforge.net/specs/rfc.fault_codes.php
+XML_RPC_FAULT_MAPPING = {
+    '-32700': exceptions.NotWellFormed,
+    '-32701': exceptions.UnsupportedEncoding,
+    '-32702': exceptions.InvalidCharacter,
+    '-32600': exceptions.SpecViolation,
+    '-32601': exceptions.MethodNotFound,
+    '-32602': exceptions.InvalidMethodParameters,
+    '-32603': exceptions.InternalError,
+    '-32500': exceptions.ApplicationError,
+    '-32400': exceptions.RemoteSystemError,
+    '-32300': exceptions.TransportError,
+}
+
 REST_SPECIAL_METHODS = {
     # 'deleteObject': 'DELETE',
     'createObject': 'POST',
@@ -45,8 +84,18 @@ REST_SPECIAL_METHODS = {
 }
 
 
-def get_session(user_agent):
-    """Sets up urllib sessions"""
+def get_session(user_agent,
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE):
+    """Sets up urllib sessions
+
+    :param string user_agent: User-Agent header value to send
+    :param integer pool_connections: number of per-host connection pools
+    :param integer pool_maxsize: keep-alive connections retained per pool.
+        Applications making many concurrent calls (iter_call concurrency,
+        multicall, call_async) can raise this to multiplex more requests
+        over persistent connections.
+    """
 
     client = requests.Session()
     client.headers.update({
@@ -54,8 +103,14 @@ def get_session(user_agent):
         'User-Agent': user_agent,
     })
     retry = Retry(connect=3, backoff_factor=3)
-    adapter = HTTPAdapter(max_retries=retry)
+    # Pinning the pool bounds keeps TCP/TLS connections alive and reused
+    # across calls instead of paying a new handshake per request.
+    adapter = HTTPAdapter(max_retries=retry,
+                          pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize)
     client.mount('https://', adapter)
+    client.mount('http://', HTTPAdapter(pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize))
     return client
 
 
@@ -148,29 +203,75 @@ class SoftLayerListResult(list):
 class XmlRpcTransport(object):
     """XML-RPC transport."""
 
-    def __init__(self, endpoint_url=None, timeout=None, proxy=None, user_agent=None, verify=True):
+    __slots__ = ('endpoint_url', 'timeout', 'proxy', 'user_agent', 'verify',
+                 'pool_connections', 'pool_maxsize',
+                 '_client', '_client_lock', '_service_urls',
+                 '_default_headers')
+
+    def __init__(self, endpoint_url=None, timeout=None, proxy=None, user_agent=None, verify=True,
+                 pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
 
         self.endpoint_url = (endpoint_url or consts.API_PUBLIC_ENDPOINT).rstrip('/')
         self.timeout = timeout or None
         self.proxy = proxy
         self.user_agent = user_agent or consts.USER_AGENT
         self.verify = verify
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
         self._client = None
+        self._client_lock = threading.Lock()
+        self._service_urls = {}
+        # Constant header pairs, built once instead of per call.
+        self._default_headers = {
+            'Content-Type': 'application/xml',
+            'User-Agent': self.user_agent,
+        }
+
+    def __getstate__(self):
+        # The pooled session and its lock cannot be deep-copied or
+        # pickled. Reduce the transport to its constructor arguments so
+        # copies (the interactive shell deep-copies its environment)
+        # rebuild their own session on first use.
+        return {'endpoint_url': self.endpoint_url,
+                'timeout': self.timeout,
+                'proxy': self.proxy,
+                'user_agent': self.user_agent,
+                'verify': self.verify,
+                'pool_connections': self.pool_connections,
+                'pool_maxsize': self.pool_maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
 
     @property
     def client(self):
         """Returns client session object"""
 
         if self._client is None:
-            self._client = get_session(self.user_agent)
+            # Double-checked so concurrent first calls (iter_call
+            # concurrency, multicall, call_async) share one pooled session
+            # instead of racing to create several.
+            with self._client_lock:
+                if self._client is None:
+                    self._client = get_session(
+                        self.user_agent,
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize)
         return self._client
 
+    def _get_service_url(self, service):
+        """Returns the endpoint URL for a service, cached per service."""
+        url = self._service_urls.get(service)
+        if url is None:
+            url = self.endpoint_url + '/' + service
+            self._service_urls[service] = url
+        return url
+
     def __call__(self, request):
         """Makes a SoftLayer API call against the XML-RPC endpoint.
 
         :param request request: Request object
         """
-        largs = list(request.args)
         headers = request.headers
 
         auth = None
@@ -198,18 +299,17 @@ class XmlRpcTransport(object):
                 'offset': request.offset or 0,
             }
 
-        largs.insert(0, {'headers': headers})
-        request.transport_headers.setdefault('Content-Type', 'application/xml')
-        request.transport_headers.setdefault('User-Agent', self.user_agent)
+        params = ({'headers': headers},) + tuple(request.args)
+        for header, value in self._default_headers.items():
+            request.transport_headers.setdefault(header, value)
 
-        request.url = '/'.join([self.endpoint_url, request.service])
-        request.payload = xmlrpc.client.dumps(tuple(largs),
+        request.url = self._get_service_url(request.service)
+        request.payload = xmlrpc.client.dumps(params,
                                               methodname=request.method,
                                               allow_none=True)
 
         # Prefer the request setting, if it's not None
-        verify = request.verify
-        if verify is None:
+        if request.verify is None:
             request.verify = self.verify
 
         try:
@@ -220,31 +320,25 @@ class XmlRpcTransport(object):
                                        timeout=self.timeout,
                                        verify=request.verify,
                                        cert=request.cert,
-                                       proxies=_proxies_dict(self.proxy))
+                                       proxies=_proxies_dict(self.proxy),
+                                       stream=True)
 
-            resp.raise_for_status()
-            result = xmlrpc.client.loads(resp.content)[0][0]
-            if isinstance(result, list):
-                return SoftLayerListResult(
-                    result, int(resp.headers.get('softlayer-total-items', 0)))
-            else:
-                return result
+            try:
+                resp.raise_for_status()
+                result = _parse_xmlrpc_response(resp)
+                if isinstance(result, list):
+                    return SoftLayerListResult(
+                        result, int(resp.headers.get('softlayer-total-items', 0)))
+                else:
+                    return result
+            finally:
+                # A streamed response that errors before being read would
+                # otherwise keep its connection checked out until garbage
+                # collection. close() releases it back to the pool promptly
+                # and is a no-op for fully read bodies.
+                resp.close()
         except xmlrpc.client.Fault as ex:
-            # These exceptions are formed from the XML-RPC spec
-            # http://xmlrpc-epi.sourceforge.net/specs/rfc.fault_codes.php
-            error_mapping = {
-                '-32700': exceptions.NotWellFormed,
-                '-32701': exceptions.UnsupportedEncoding,
-                '-32702': exceptions.InvalidCharacter,
-                '-32600': exceptions.SpecViolation,
-                '-32601': exceptions.MethodNotFound,
-                '-32602': exceptions.InvalidMethodParameters,
-                '-32603': exceptions.InternalError,
-                '-32500': exceptions.ApplicationError,
-                '-32400': exceptions.RemoteSystemError,
-                '-32300': exceptions.TransportError,
-            }
-            _ex = error_mapping.get(ex.faultCode, exceptions.SoftLayerAPIError)
+            _ex = XML_RPC_FAULT_MAPPING.get(ex.faultCode, exceptions.SoftLayerAPIError)
             raise _ex(ex.faultCode, ex.faultString) from ex
         except requests.HTTPError as ex:
             raise exceptions.TransportError(ex.response.status_code, str(ex))
@@ -300,21 +394,48 @@ class RestTransport(object):
     XML-RPC should be used when in doubt
     """
 
-    def __init__(self, endpoint_url=None, timeout=None, proxy=None, user_agent=None, verify=True):
+    __slots__ = ('endpoint_url', 'timeout', 'proxy', 'user_agent', 'verify',
+                 'pool_connections', 'pool_maxsize',
+                 '_client', '_client_lock')
+
+    def __init__(self, endpoint_url=None, timeout=None, proxy=None, user_agent=None, verify=True,
+                 pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
 
         self.endpoint_url = (endpoint_url or consts.API_PUBLIC_ENDPOINT_REST).rstrip('/')
         self.timeout = timeout or None
         self.proxy = proxy
         self.user_agent = user_agent or consts.USER_AGENT
         self.verify = verify
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
         self._client = None
+        self._client_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Same as XmlRpcTransport: drop the session and lock so copies
+        # rebuild them lazily.
+        return {'endpoint_url': self.endpoint_url,
+                'timeout': self.timeout,
+                'proxy': self.proxy,
+                'user_agent': self.user_agent,
+                'verify': self.verify,
+                'pool_connections': self.pool_connections,
+                'pool_maxsize': self.pool_maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
 
     @property
     def client(self):
         """Returns client session object"""
 
         if self._client is None:
-            self._client = get_session(self.user_agent)
+            with self._client_lock:
+                if self._client is None:
+                    self._client = get_session(
+                        self.user_agent,
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize)
         return self._client
 
     def __call__(self, request):
@@ -393,7 +514,7 @@ class RestTransport(object):
 
             if resp.text != "":
                 try:
-                    result = json.loads(resp.text)
+                    result = json_loads(resp.text)
                 except ValueError as json_ex:
                     raise exceptions.SoftLayerAPIError(resp.status_code, str(json_ex))
             else:
@@ -408,7 +529,7 @@ class RestTransport(object):
                 return result
         except requests.HTTPError as ex:
             try:
-                message = json.loads(ex.response.text)['error']
+                message = json_loads(ex.response.text)['error']
                 request.url = ex.response.url
             except ValueError as json_ex:
                 if ex.response.text == "":
@@ -448,6 +569,8 @@ class RestTransport(object):
 class DebugTransport(object):
     """Transport that records API call timings."""
 
+    __slots__ = ('transport', 'requests')
+
     def __init__(self, transport):
         self.transport = transport
 
@@ -496,6 +619,8 @@ class DebugTransport(object):
 class TimingTransport(object):
     """Transport that records API call timings."""
 
+    __slots__ = ('transport', 'last_calls')
+
     def __init__(self, transport):
         self.transport = transport
         self.last_calls = []
@@ -528,6 +653,8 @@ class TimingTransport(object):
 class FixtureTransport(object):
     """Implements a transport which returns fixtures."""
 
+    __slots__ = ()
+
     def __call__(self, call):
         """Load fixture from the default fixture path."""
         try:
@@ -547,6 +674,27 @@ class FixtureTransport(object):
         return call.service
 
 
+def _parse_xmlrpc_response(response):
+    """Parses an XML-RPC response body incrementally.
+
+    The body is fed into the expat-backed xmlrpc parser in chunks as it
+    arrives instead of being buffered in full first, which overlaps network
+    reads with parse work on large responses. Raises xmlrpc.client.Fault
+    for fault responses, just like xmlrpc.client.loads.
+
+    :param response: a streamed requests response object
+    """
+    parser, unmarshaller = xmlrpc.client.getparser()
+    if defused_xmlrpc is not None:
+        # Scoped here rather than monkey-patching xmlrpc.client globally,
+        # so other users of the stdlib module in the process are unaffected.
+        parser = defused_xmlrpc.DefusedExpatParser(unmarshaller)
+    for chunk in response.iter_content(chunk_size=65536):
+        parser.feed(chunk)
+    parser.close()
+    return unmarshaller.close()[0]
+
+
 def _proxies_dict(proxy):
     """Makes a proxy dict appropriate to pass to requests."""
     if not proxy:
@@ -565,9 +713,7 @@ def _format_object_mask(objectmask):
     """
     objectmask = objectmask.strip()
 
-    if (not objectmask.startswith('mask') and
-            not objectmask.startswith('[') and
-            not objectmask.startswith('filteredMask')):
+    if not objectmask.startswith(('mask', '[', 'filteredMask')):
         objectmask = "mask[%s]" % objectmask
     return objectmask
 
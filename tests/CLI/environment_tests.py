@@ -5,9 +5,12 @@
     :license: MIT, see LICENSE for more details.
 """
 
+import copy
+
 import click
 import mock
 
+import SoftLayer
 from SoftLayer.CLI import environment
 from SoftLayer import testing
 
@@ -28,6 +31,18 @@ class EnvironmentTests(testing.TestCase):
         self.assertIn('virtual', actions)
         self.assertIn('dns', actions)
 
+    def test_deepcopy(self):
+        # The shell deep-copies the environment at startup, which pulls
+        # in the client and its transport chain.
+        self.env.client = SoftLayer.BaseClient(
+            transport=SoftLayer.DebugTransport(
+                SoftLayer.XmlRpcTransport(endpoint_url='http://something')))
+
+        env = copy.deepcopy(self.env)
+
+        self.assertIsInstance(env.client, SoftLayer.BaseClient)
+        self.assertIsNot(env.client, self.env.client)
+
     def test_get_command_invalid(self):
         cmd = self.env.get_command('invalid', 'command')
         self.assertEqual(cmd, None)
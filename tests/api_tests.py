@@ -4,6 +4,8 @@
 
     :license: MIT, see LICENSE for more details.
 """
+import copy
+
 import mock
 
 import SoftLayer
@@ -56,6 +58,38 @@ class Initialization(testing.TestCase):
 
 class ClientMethods(testing.TestCase):
 
+    @mock.patch('SoftLayer.config.get_client_settings')
+    def test_lazy_default_transport(self, get_client_settings):
+        get_client_settings.return_value = {
+            'endpoint_url': 'http://endpoint_url/',
+        }
+        client = SoftLayer.BaseClient()
+
+        self.assertFalse(get_client_settings.called)
+        self.assertIsInstance(client.transport, transports.XmlRpcTransport)
+        self.assertEqual(client.transport.endpoint_url, 'http://endpoint_url')
+
+    @mock.patch('SoftLayer.config.get_client_settings')
+    def test_lazy_default_rest_transport(self, get_client_settings):
+        get_client_settings.return_value = {
+            'endpoint_url': 'http://example.com/v3/rest/',
+        }
+        client = SoftLayer.BaseClient()
+
+        self.assertIsInstance(client.transport, transports.RestTransport)
+
+    def test_deepcopy(self):
+        # The interactive shell deep-copies its whole environment,
+        # client included, so clients must survive copy.deepcopy().
+        client = SoftLayer.BaseClient(transport=mock.Mock(), cache_ttl=60)
+        self.assertIsNotNone(client['SERVICE'])
+
+        clone = copy.deepcopy(client)
+
+        self.assertIsInstance(clone, SoftLayer.BaseClient)
+        self.assertEqual(clone._cache_ttl, 60)
+        self.assertIsNot(clone._cache_lock, client._cache_lock)
+
     def test_repr(self):
         client = SoftLayer.Client(
             username='doesnotexist',
@@ -217,6 +251,96 @@ class APIClient(testing.TestCase):
             lambda: list(self.client.iter_call('SERVICE', 'METHOD',
                                                iter=True, limit=0)))
 
+    @mock.patch('SoftLayer.API.BaseClient.call')
+    def test_iter_call_concurrent(self, _call):
+        # Pages are requested in parallel but must come back in order
+        def _fake_call(service, method, limit=None, offset=None, **kwargs):
+            return transports.SoftLayerListResult(
+                range(offset, min(offset + limit, 225)), 225)
+        _call.side_effect = _fake_call
+
+        result = list(self.client.iter_call('SERVICE', 'METHOD',
+                                            concurrency=4))
+
+        self.assertEqual(list(range(225)), result)
+        _call.assert_has_calls([
+            mock.call('SERVICE', 'METHOD', limit=100, iter=False, offset=0),
+        ])
+        _call.assert_any_call('SERVICE', 'METHOD',
+                              limit=100, iter=False, offset=100)
+        _call.assert_any_call('SERVICE', 'METHOD',
+                              limit=100, iter=False, offset=200)
+        self.assertEqual(_call.call_count, 3)
+
+    @mock.patch('SoftLayer.API.BaseClient.call')
+    def test_iter_call_concurrent_non_list(self, _call):
+        _call.side_effect = ["test"]
+
+        result = list(self.client.iter_call('SERVICE', 'METHOD',
+                                            concurrency=4))
+
+        self.assertEqual(["test"], result)
+        self.assertEqual(_call.call_count, 1)
+
+    def test_call_async(self):
+        mocked = self.set_mock('SoftLayer_SERVICE', 'METHOD')
+        mocked.return_value = {"test": "result"}
+
+        future = self.client.call_async('SERVICE', 'METHOD', mask="id")
+
+        self.assertEqual(future.result(), {"test": "result"})
+        self.assert_called_with('SoftLayer_SERVICE', 'METHOD',
+                                mask='mask[id]')
+
+    def test_close(self):
+        mocked = self.set_mock('SoftLayer_SERVICE', 'METHOD')
+        mocked.return_value = {"test": "result"}
+
+        # close() before any async use is a no-op
+        self.client.close()
+
+        self.client.call_async('SERVICE', 'METHOD').result()
+        self.client.close()
+
+        # The client stays usable after close()
+        future = self.client.call_async('SERVICE', 'METHOD')
+        self.assertEqual(future.result(), {"test": "result"})
+        self.client.close()
+
+    def test_deepcopy_after_async_use(self):
+        transport = mock.Mock()
+        transport.return_value = {"test": "result"}
+        client = SoftLayer.BaseClient(transport=transport)
+
+        client.call_async('SERVICE', 'METHOD').result()
+
+        clone = copy.deepcopy(client)
+
+        # The live executor stays with the original; the copy builds its
+        # own on first async use.
+        self.assertIsNone(clone._executor)
+        self.assertIsNotNone(client._executor)
+
+    def test_multicall(self):
+        mocked = self.set_mock('SoftLayer_SERVICE', 'METHOD')
+        mocked.return_value = {"test": "result"}
+        mocked_other = self.set_mock('SoftLayer_SERVICE', 'OTHER_METHOD')
+        mocked_other.return_value = {"other": "result"}
+
+        results = self.client.multicall([
+            ('SERVICE', 'METHOD'),
+            ('SERVICE', 'METHOD', ('ARG',)),
+            ('SERVICE', 'OTHER_METHOD', (), {'mask': 'id'}),
+        ])
+
+        self.assertEqual(results, [{"test": "result"},
+                                   {"test": "result"},
+                                   {"other": "result"}])
+        self.assert_called_with('SoftLayer_SERVICE', 'METHOD',
+                                args=('ARG',))
+        self.assert_called_with('SoftLayer_SERVICE', 'OTHER_METHOD',
+                                mask='mask[id]')
+
     def test_call_invalid_arguments(self):
         self.assertRaises(
             TypeError,
@@ -265,6 +389,64 @@ class APIClient(testing.TestCase):
         self.assert_called_with('BluePages_Search', 'findBluePagesProfile')
 
 
+class APIClientCache(testing.TestCase):
+
+    def set_up(self):
+        self.cached_client = SoftLayer.BaseClient(transport=self.mocks,
+                                                  cache_ttl=60)
+
+    def test_cacheable_call_is_cached(self):
+        mocked = self.set_mock('SoftLayer_SERVICE', 'METHOD')
+        mocked.return_value = {"test": "result"}
+
+        resp1 = self.cached_client.call('SERVICE', 'METHOD', cacheable=True)
+        resp2 = self.cached_client.call('SERVICE', 'METHOD', cacheable=True)
+
+        self.assertEqual(resp1, {"test": "result"})
+        self.assertEqual(resp2, {"test": "result"})
+        self.assertEqual(len(self.calls('SoftLayer_SERVICE', 'METHOD')), 1)
+
+    def test_different_arguments_not_shared(self):
+        mocked = self.set_mock('SoftLayer_SERVICE', 'METHOD')
+        mocked.return_value = {"test": "result"}
+
+        self.cached_client.call('SERVICE', 'METHOD', cacheable=True)
+        self.cached_client.call('SERVICE', 'METHOD', 'ARG', cacheable=True)
+        self.cached_client.call('SERVICE', 'METHOD', mask="id", cacheable=True)
+
+        self.assertEqual(len(self.calls('SoftLayer_SERVICE', 'METHOD')), 3)
+
+    def test_uncacheable_call_not_cached(self):
+        mocked = self.set_mock('SoftLayer_SERVICE', 'METHOD')
+        mocked.return_value = {"test": "result"}
+
+        self.cached_client.call('SERVICE', 'METHOD')
+        self.cached_client.call('SERVICE', 'METHOD')
+
+        self.assertEqual(len(self.calls('SoftLayer_SERVICE', 'METHOD')), 2)
+
+    def test_cache_disabled_by_default(self):
+        mocked = self.set_mock('SoftLayer_SERVICE', 'METHOD')
+        mocked.return_value = {"test": "result"}
+
+        self.client.call('SERVICE', 'METHOD', cacheable=True)
+        self.client.call('SERVICE', 'METHOD', cacheable=True)
+
+        self.assertEqual(len(self.calls('SoftLayer_SERVICE', 'METHOD')), 2)
+
+    @mock.patch('SoftLayer.API.time.time')
+    def test_expired_entries_refetched(self, _time):
+        mocked = self.set_mock('SoftLayer_SERVICE', 'METHOD')
+        mocked.return_value = {"test": "result"}
+
+        _time.return_value = 0
+        self.cached_client.call('SERVICE', 'METHOD', cacheable=True)
+        _time.return_value = 61
+        self.cached_client.call('SERVICE', 'METHOD', cacheable=True)
+
+        self.assertEqual(len(self.calls('SoftLayer_SERVICE', 'METHOD')), 2)
+
+
 class UnauthenticatedAPIClient(testing.TestCase):
     def set_up(self):
         self.client = SoftLayer.Client(endpoint_url="ENDPOINT")
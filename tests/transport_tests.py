@@ -4,6 +4,7 @@
 
     :license: MIT, see LICENSE for more details.
 """
+import copy
 import io
 import warnings
 
@@ -79,7 +80,8 @@ class TestXmlRpcAPICall(testing.TestCase):
                                    timeout=None,
                                    cert=None,
                                    verify=True,
-                                   auth=None)
+                                   auth=None,
+                                   stream=True)
         self.assertEqual(resp, [])
         self.assertIsInstance(resp, transports.SoftLayerListResult)
         self.assertEqual(resp.total_count, 10)
@@ -96,6 +98,34 @@ class TestXmlRpcAPICall(testing.TestCase):
             warnings.warn("Incorrect Exception raised. Expected a "
                           "SoftLayer.TransportError error")
 
+    def test_pool_bounds(self):
+        transport = transports.XmlRpcTransport(
+            endpoint_url='http://something.com',
+            pool_connections=5,
+            pool_maxsize=20,
+        )
+
+        adapter = transport.client.get_adapter('http://something.com')
+        self.assertEqual(adapter._pool_connections, 5)
+        self.assertEqual(adapter._pool_maxsize, 20)
+
+    def test_pool_bounds_defaults(self):
+        adapter = self.transport.client.get_adapter('https://something.com')
+        self.assertEqual(adapter._pool_connections,
+                         transports.POOL_CONNECTIONS)
+        self.assertEqual(adapter._pool_maxsize, transports.POOL_MAXSIZE)
+
+    def test_deepcopy(self):
+        # The interactive shell deep-copies its environment, transports
+        # included. The session and its lock stay with the original.
+        self.assertIsNotNone(self.transport.client)
+
+        clone = copy.deepcopy(self.transport)
+
+        self.assertIsNone(clone._client)
+        self.assertIsNot(clone._client_lock, self.transport._client_lock)
+        self.assertEqual(clone.endpoint_url, self.transport.endpoint_url)
+
     @mock.patch('SoftLayer.transports.requests.Session.request')
     def test_valid_proxy(self, request):
         request.return_value = self.response
@@ -116,7 +146,8 @@ class TestXmlRpcAPICall(testing.TestCase):
             timeout=None,
             cert=None,
             verify=True,
-            auth=None)
+            auth=None,
+            stream=True)
 
     @mock.patch('SoftLayer.transports.requests.Session.request')
     def test_identifier(self, request):
@@ -321,7 +352,8 @@ class TestXmlRpcAPICall(testing.TestCase):
                                    timeout=None,
                                    cert=None,
                                    verify=True,
-                                   auth=mock.ANY)
+                                   auth=mock.ANY,
+                                   stream=True)
         self.assertEqual(resp, [])
         self.assertIsInstance(resp, transports.SoftLayerListResult)
         self.assertEqual(resp.total_count, 10)
@@ -374,7 +406,8 @@ def test_verify(request,
                                proxies=mock.ANY,
                                timeout=mock.ANY,
                                verify=expected,
-                               auth=None)
+                               auth=None,
+                               stream=True)
 
 
 class TestRestAPICall(testing.TestCase):
@@ -384,6 +417,14 @@ class TestRestAPICall(testing.TestCase):
             endpoint_url='http://something.com',
         )
 
+    def test_deepcopy(self):
+        self.assertIsNotNone(self.transport.client)
+
+        clone = copy.deepcopy(self.transport)
+
+        self.assertIsNone(clone._client)
+        self.assertEqual(clone.endpoint_url, self.transport.endpoint_url)
+
     @mock.patch('SoftLayer.transports.requests.Session.request')
     def test_basic(self, request):
         request().content = '[]'